@@ -13,10 +13,12 @@ Features:
   - `--exclude-course-ids` and `--exclude-name-contains` to skip specific courses
   - `--config` YAML/JSON file for exclusions, per-course weights, per-course final policies, and Canvas auth
   - CLI flags still work; precedence is: CLI > config > env > Canvas
+  - On-disk response cache with ETag revalidation (`--refresh` / `--no-cache`)
 
 Requirements:
   - Python 3.9+
   - requests, pydantic, pyyaml (pip install requests pydantic pyyaml)
+  - optional: orjson for faster JSON decoding of Canvas responses
 
 Auth sources (precedence: CLI > config > ENV):
   - CLI: --base-url, --token
@@ -27,30 +29,55 @@ from __future__ import annotations
 
 import argparse
 import csv
+import hashlib
 import json
 import os
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import yaml  # type: ignore
 except Exception:
     yaml = None
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None
+
+# Canvas pages are decoded with orjson's C parser when available
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Canvas requests are network-bound, so courses are fetched on a small thread pool.
+MAX_WORKERS = 8
+
+# Seconds a cached response is served without asking Canvas (0 = always revalidate)
+COURSES_CACHE_TTL = 15 * 60
+COURSE_CACHE_TTL = 12 * 60 * 60
+
 # ----------------------------- Models ----------------------------- #
 
-class Submission(BaseModel):
-    score: Optional[float] = None
-    workflow_state: Optional[str] = None
-    missing: Optional[bool] = None
-    excused: Optional[bool] = None
+# Assignments are built once per row of trusted Canvas JSON, so they are plain
+# (slotted where supported) dataclasses instead of validating pydantic models.
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# (score, missing, excused) of an assignment's submission
+SubmissionTuple = Tuple[Optional[float], bool, bool]
+NO_SUBMISSION: SubmissionTuple = (None, False, False)
 
-class Assignment(BaseModel):
+@dataclass(**_DATACLASS_SLOTS)
+class Assignment:
     id: int
     name: str
     points_possible: Optional[float] = None
@@ -58,7 +85,7 @@ class Assignment(BaseModel):
     muted: Optional[bool] = None
     published: Optional[bool] = True
     due_at: Optional[str] = None
-    submission: Optional[Submission] = None
+    sub_raw: Optional[SubmissionTuple] = None
 
 class AssignmentGroup(BaseModel):
     id: int
@@ -86,50 +113,199 @@ class CourseRollup(BaseModel):
 
 # ----------------------------- API Client ----------------------------- #
 
+def default_cache_dir() -> str:
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg_cache, "canvas-grade-calculator")
+
+
+def page_urls_until(last_url: str) -> List[str]:
+    """
+    Build the URLs for pages 2..N from a rel="last" link. Returns [] when the
+    link does not carry a numeric page (e.g. Canvas bookmark pagination).
+    """
+    parts = urlsplit(last_url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    page = [v for k, v in query if k == "page"]
+    if len(page) != 1 or not page[0].isdigit():
+        return []
+    urls = []
+    for n in range(2, int(page[0]) + 1):
+        q = [(k, str(n) if k == "page" else v) for k, v in query]
+        urls.append(urlunsplit(parts._replace(query=urlencode(q))))
+    return urls
+
+
+class ResponseCache:
+    """
+    On-disk cache of Canvas GET pages, one JSON file per request.
+    Entries keep the ETag/Last-Modified validators so stale pages can be
+    revalidated with a conditional request (304) instead of re-downloaded.
+    Cache I/O is best-effort: any failure just behaves like a miss.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def store(self, key: str, entry: Dict[str, Any]):
+        tmp = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, self._path(key))  # atomic, so concurrent workers never see partial files
+        except Exception:
+            if tmp:
+                try:
+                    os.unlink(tmp)  # nothing evicts entries, so don't leave orphaned temp files
+                except OSError:
+                    pass
+
+
 class CanvasClient:
-    def __init__(self, base_url: str, token: str, timeout: int = 30):
+    def __init__(self, base_url: str, token: str, timeout: int = 30, cache_dir: Optional[str] = None, refresh: bool = False):
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
-        self.session.headers.update({"Authorization": f"Bearer {token}"})
+        # Pool sized above MAX_WORKERS so concurrent course fetches reuse keep-alive connections.
+        # Course workers each fan out page fetches (up to MAX_WORKERS**2 requests in flight),
+        # so pool_block caps connections per host at pool_maxsize instead of opening extras.
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            pool_block=True,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                raise_on_status=False,  # let _get report the final status
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
         self.timeout = timeout
-
-    def _get(self, path: str, params: Optional[dict] = None):
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.refresh = refresh  # --refresh: ignore cached pages, but still store fresh ones
+        # Cache entries are per user, so the token is part of every key (hashed, never stored)
+        self._cache_salt = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        # The client lives for a single run, so course lists are memoized per enrollment state
+        self._courses_cache: Dict[str, List[dict]] = {}
+
+    def _cache_key(self, url: str, params: Optional[dict]) -> str:
+        raw = json.dumps([self._cache_salt, url, params or {}], sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _fetch_page(self, url: str, params: Optional[dict], max_age: float) -> Tuple[Any, str]:
+        """GET one page, going through the response cache. Returns (json data, Link header)."""
+        entry = None
+        key = ""
+        if self.cache is not None:
+            key = self._cache_key(url, params)
+            entry = None if self.refresh else self.cache.load(key)
+        if entry and max_age > 0 and time.time() - entry.get("stored_at", 0) < max_age:
+            return entry["data"], entry.get("link", "")
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        resp = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304 and entry:
+            # An unchanged page can still sit in a longer list, so paging must follow the
+            # 304's own Link header; a list page revalidated without one is re-fetched.
+            link = resp.headers.get("Link")
+            if link is not None or not isinstance(entry.get("data"), list):
+                if link is not None:
+                    entry["link"] = link
+                entry["stored_at"] = time.time()
+                self.cache.store(key, entry)
+                return entry["data"], entry.get("link", "")
+            resp = self.session.get(url, params=params, timeout=self.timeout)
+        if not resp.ok:
+            raise RuntimeError(f"GET {url} failed: {resp.status_code} {resp.text}")
+        data = _json_loads(resp.content)
+        link = resp.headers.get("Link", "")
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if self.cache is not None and (etag or last_modified or max_age > 0):
+            self.cache.store(key, {
+                "stored_at": time.time(),
+                "etag": etag,
+                "last_modified": last_modified,
+                "link": link,
+                "data": data,
+            })
+        return data, link
+
+    def _get(self, path: str, params: Optional[dict] = None, max_age: float = 0):
         url = f"{self.base_url}{path}"
         items = []
+        first_page = True
         while url:
-            resp = self.session.get(url, params=params, timeout=self.timeout)
-            if not resp.ok:
-                raise RuntimeError(f"GET {url} failed: {resp.status_code} {resp.text}")
-            data = resp.json()
+            data, link_header = self._fetch_page(url, params, max_age)
             if isinstance(data, list):
                 items.extend(data)
             else:
                 return data
             next_url = None
-            links = requests.utils.parse_header_links(resp.headers.get("Link", ""))
+            last_url = None
+            links = requests.utils.parse_header_links(link_header)
             for link in links:
                 if link.get("rel") == "next":
                     next_url = link.get("url")
+                elif link.get("rel") == "last":
+                    last_url = link.get("url")
+            if first_page and next_url and last_url:
+                page_urls = page_urls_until(last_url)
+                if page_urls:
+                    # Numbered pages: fetch 2..last concurrently instead of walking rel="next"
+                    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+                        for page_data, _ in ex.map(lambda u: self._fetch_page(u, None, max_age), page_urls):
+                            items.extend(page_data)
+                    return items
+            first_page = False
             url = next_url
             params = None
         return items
 
     def get_course(self, course_id: int):
-        return self._get(f"/api/v1/courses/{course_id}")
+        return self._get(f"/api/v1/courses/{course_id}", max_age=COURSE_CACHE_TTL)
 
     def list_my_courses(self, state: str = "active") -> List[dict]:
+        if state in self._courses_cache:
+            return self._courses_cache[state]
         params = {"enrollment_state": state, "per_page": 100}
-        return self._get("/api/v1/courses", params=params)
+        courses = self._get("/api/v1/courses", params=params, max_age=COURSES_CACHE_TTL)
+        self._courses_cache[state] = courses
+        return courses
 
     def get_assignment_groups(self, course_id: int) -> Tuple[List[AssignmentGroup], Dict[int, AssignmentGroup]]:
         raw = self._get(
             f"/api/v1/courses/{course_id}/assignment_groups",
-            params={"include[]": ["assignments"]},
+            # Only id/name/group_weight are used; assignments come from their own endpoint
+            params={"per_page": 100},
         )
         groups = []
         by_id: Dict[int, AssignmentGroup] = {}
         for g in raw:
-            ag = AssignmentGroup(id=g["id"], name=g["name"], group_weight=g.get("group_weight"))
+            # Trusted Canvas payload: construct() skips pydantic validation
+            ag = AssignmentGroup.construct(id=g["id"], name=g["name"], group_weight=g.get("group_weight"))
             groups.append(ag)
             by_id[ag.id] = ag
         return groups, by_id
@@ -137,11 +313,12 @@ class CanvasClient:
     def get_assignments_with_submissions(self, course_id: int) -> List[Assignment]:
         items = self._get(
             f"/api/v1/courses/{course_id}/assignments",
+            # Only the submission is included; other include[] options add payload we never read
             params={"include[]": ["submission"], "per_page": 100},
         )
         result: List[Assignment] = []
         for a in items:
-            sub = a.get("submission") or {}
+            sub = a.get("submission")
             assignment = Assignment(
                 id=a["id"],
                 name=a["name"],
@@ -150,11 +327,10 @@ class CanvasClient:
                 muted=a.get("muted"),
                 published=a.get("published", True),
                 due_at=a.get("due_at"),
-                submission=Submission(
-                    score=sub.get("score"),
-                    workflow_state=sub.get("workflow_state"),
-                    missing=sub.get("missing"),
-                    excused=sub.get("excused"),
+                sub_raw=(
+                    sub.get("score"),
+                    bool(sub.get("missing")),
+                    sub.get("excused") is True,
                 ) if sub else None,
             )
             result.append(assignment)
@@ -194,77 +370,133 @@ class FinalPolicy:
     MISSING_ZERO_UPCOMING_IGNORE = "missing_zero_upcoming_ignore"  # default
     ALL_ZERO = "all_zero"
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Tally:
     earned: float = 0.0
     possible: float = 0.0
 
 
-def categorize_assignments(assignments: List[Assignment], groups_by_id: Dict[int, AssignmentGroup]):
-    by_group: Dict[int, List[Assignment]] = {}
-    for a in assignments:
-        gid = a.assignment_group_id or -1
-        by_group.setdefault(gid, []).append(a)
+def ensure_uncategorized_group(groups_by_id: Dict[int, AssignmentGroup]):
+    # Assignments without a group are reported under a synthetic group id -1
     if -1 not in groups_by_id:
         groups_by_id[-1] = AssignmentGroup(id=-1, name="(Uncategorized)", group_weight=None)
-    return by_group
 
 
-def compute_category_results(
-    by_group: Dict[int, List[Assignment]],
+# Per-policy tally loops. Each returns {group id: (running, final)} and is written
+# out separately so the policy is not re-tested for every assignment. Groups holding
+# only uncounted assignments still get a (zero) entry.
+
+def _tally_ignore_all(assignments: List[Assignment]) -> Dict[int, Tuple[Tally, Tally]]:
+    tallies: Dict[int, Tuple[Tally, Tally]] = {}
+    for a in assignments:
+        gid = a.assignment_group_id or -1
+        pair = tallies.get(gid)
+        if pair is None:
+            pair = tallies[gid] = (Tally(), Tally())
+        if not a.published:
+            continue
+        pts = a.points_possible or 0.0
+        if pts <= 0:
+            continue
+        score, _, excused = a.sub_raw or NO_SUBMISSION
+        if score is not None and not excused:
+            running, final = pair
+            earned = max(0.0, float(score))
+            running.earned += earned
+            running.possible += pts
+            final.earned += earned
+            final.possible += pts
+    return tallies
+
+
+def _tally_all_zero(assignments: List[Assignment]) -> Dict[int, Tuple[Tally, Tally]]:
+    tallies: Dict[int, Tuple[Tally, Tally]] = {}
+    for a in assignments:
+        gid = a.assignment_group_id or -1
+        pair = tallies.get(gid)
+        if pair is None:
+            pair = tallies[gid] = (Tally(), Tally())
+        if not a.published:
+            continue
+        pts = a.points_possible or 0.0
+        if pts <= 0:
+            continue
+        running, final = pair
+        score, _, excused = a.sub_raw or NO_SUBMISSION
+        if score is not None and not excused:
+            earned = max(0.0, float(score))
+            running.earned += earned
+            running.possible += pts
+            final.earned += earned
+        final.possible += pts
+    return tallies
+
+
+def _tally_missing_zero(assignments: List[Assignment]) -> Dict[int, Tuple[Tally, Tally]]:
+    tallies: Dict[int, Tuple[Tally, Tally]] = {}
+    for a in assignments:
+        gid = a.assignment_group_id or -1
+        pair = tallies.get(gid)
+        if pair is None:
+            pair = tallies[gid] = (Tally(), Tally())
+        if not a.published:
+            continue
+        pts = a.points_possible or 0.0
+        if pts <= 0:
+            continue
+        running, final = pair
+        score, missing, excused = a.sub_raw or NO_SUBMISSION
+        if score is not None and not excused:
+            earned = max(0.0, float(score))
+            running.earned += earned
+            running.possible += pts
+            final.earned += earned
+            final.possible += pts
+        elif missing:
+            final.possible += pts
+    return tallies
+
+
+_TALLY_BY_POLICY = {
+    FinalPolicy.IGNORE_ALL: _tally_ignore_all,
+    FinalPolicy.ALL_ZERO: _tally_all_zero,
+    FinalPolicy.MISSING_ZERO_UPCOMING_IGNORE: _tally_missing_zero,
+}
+
+
+def compute_course(
+    assignments: List[Assignment],
     groups_by_id: Dict[int, AssignmentGroup],
     weight_plan: WeightPlan,
     final_policy: str,
 ) -> List[CategoryResult]:
-    results: List[CategoryResult] = []
-    name_by_id = {gid: groups_by_id[gid].name for gid in by_group}
-
-    for gid, assignments in sorted(by_group.items(), key=lambda kv: name_by_id[kv[0]].lower()):
-        g = groups_by_id[gid]
-        group_name = g.name
-        weight_pct = weight_plan.by_group_name.get(group_name, 0.0)
-
-        running = Tally()
-        final = Tally()
-
-        for a in assignments:
-            if not a.published:
-                continue
-            pts = a.points_possible or 0.0
-            if pts <= 0:
-                continue
-            sub = a.submission
-            is_graded = sub is not None and sub.score is not None and (sub.excused is not True)
-            is_missing = bool(sub and sub.missing)
-
-            if is_graded:
-                running.earned += max(0.0, float(sub.score))
-                running.possible += pts
-
-            if final_policy == FinalPolicy.IGNORE_ALL:
-                if is_graded:
-                    final.earned += max(0.0, float(sub.score))
-                    final.possible += pts
-            elif final_policy == FinalPolicy.ALL_ZERO:
-                if is_graded:
-                    final.earned += max(0.0, float(sub.score))
-                final.possible += pts
-            else:  # MISSING_ZERO_UPCOMING_IGNORE
-                if is_graded:
-                    final.earned += max(0.0, float(sub.score))
-                    final.possible += pts
-                else:
-                    if is_missing:
-                        final.possible += pts
+    """
+    Single pass over the course's assignments, accumulating (running, final)
+    tallies per assignment group, then one CategoryResult per group sorted
+    by group name.
+    """
+    ensure_uncategorized_group(groups_by_id)
+    # Resolve the policy once per course; unknown values behave like the default
+    tally = _TALLY_BY_POLICY.get(final_policy, _tally_missing_zero)
+    tallies = tally(assignments)
 
+    results: List[CategoryResult] = []
+    # Decorate-sort-undecorate on the lowercased name; the first-seen index keeps
+    # ties in their original order
+    entries = sorted(
+        (groups_by_id[gid].name.lower(), i, gid, groups_by_id[gid].name)
+        for i, gid in enumerate(tallies)
+    )
+    for _, _, gid, group_name in entries:
+        running, final = tallies[gid]
         running_pct = (running.earned / running.possible * 100.0) if running.possible > 0 else None
         final_pct = (final.earned / final.possible * 100.0) if final.possible > 0 else None
-
+        # Every field is computed above with the right type, so skip validation
         results.append(
-            CategoryResult(
+            CategoryResult.construct(
                 group_id=gid,
                 group_name=group_name,
-                weight_pct=weight_pct,
+                weight_pct=weight_plan.by_group_name.get(group_name, 0.0),
                 running_earned=running.earned,
                 running_possible=running.possible,
                 running_pct=running_pct,
@@ -273,7 +505,6 @@ def compute_category_results(
                 final_pct=final_pct,
             )
         )
-
     return results
 
 
@@ -297,18 +528,36 @@ def weighted_total(categories: List[CategoryResult]) -> Tuple[Optional[float], O
 
 # ----------------------------- Config Loading/Merge ----------------------------- #
 
+def json_sidecar(path: str) -> Optional[str]:
+    """
+    The setup script writes <config>.yaml.json next to a YAML config. Return it
+    when it is at least as new as the YAML (i.e. the YAML was not edited since),
+    so the config loads with the json parser instead of PyYAML.
+    """
+    sidecar = path + ".json"
+    try:
+        if os.path.getmtime(sidecar) >= os.path.getmtime(path):
+            return sidecar
+    except OSError:
+        pass
+    return None
+
+
 def load_config(path: Optional[str]) -> Dict[str, Any]:
     if not path:
         return {}
     if not os.path.exists(path):
         raise FileNotFoundError(path)
-    text = open(path, "r", encoding="utf-8").read()
     if path.lower().endswith((".yml", ".yaml")):
-        if yaml is None:
-            raise RuntimeError("PyYAML is required for YAML configs: pip install pyyaml")
-        data = yaml.safe_load(text) or {}
+        sidecar = json_sidecar(path)
+        if sidecar:
+            data = json.loads(open(sidecar, "r", encoding="utf-8").read() or "{}") or {}
+        else:
+            if yaml is None:
+                raise RuntimeError("PyYAML is required for YAML configs: pip install pyyaml")
+            data = yaml.safe_load(open(path, "r", encoding="utf-8").read()) or {}
     else:
-        data = json.loads(text or "{}")
+        data = json.loads(open(path, "r", encoding="utf-8").read() or "{}")
     # normalize shapes
     data.setdefault("canvas", {})  # holds base_url/token
     data.setdefault("weights", {})
@@ -320,9 +569,21 @@ def load_config(path: Optional[str]) -> Dict[str, Any]:
     data.setdefault("exclusions", {})
     data["exclusions"].setdefault("ids", [])
     data["exclusions"].setdefault("name_contains", [])
+    # Course ids may be written as ints or strings; key both maps by str once so
+    # per-course lookups are a single dict hit. A null map (setup writes one when
+    # there are no overrides) is treated like a missing one.
+    data["weights"]["by_course_id"] = _str_keys(data["weights"]["by_course_id"] or {})
+    data["final_policy"]["by_course_id"] = _str_keys(data["final_policy"]["by_course_id"] or {})
     return data
 
 
+def _str_keys(by_id: Dict[Any, Any]) -> Dict[str, Any]:
+    # String keys win over int keys for the same course, as in the original lookup order
+    out = {str(k): v for k, v in by_id.items() if not isinstance(k, str)}
+    out.update((k, v) for k, v in by_id.items() if isinstance(k, str))
+    return out
+
+
 def discover_config_path(cli_path: Optional[str]) -> Optional[str]:
     """
     Determine which config file to load, in this order:
@@ -381,11 +642,10 @@ def get_effective_weights(course_id: int, cli_weights: Optional[Dict[str, float]
     # Precedence: CLI > config.by_course_id > config.default > None (fall back to Canvas)
     if cli_weights:
         return cli_weights
-    by_id = (cfg.get("weights", {}) or {}).get("by_course_id", {})
-    if str(course_id) in by_id:
-        return by_id[str(course_id)]
-    if course_id in by_id:
-        return by_id[course_id]
+    by_id = (cfg.get("weights", {}) or {}).get("by_course_id") or {}  # str-keyed by load_config
+    key = str(course_id)
+    if key in by_id:
+        return by_id[key]
     default_w = (cfg.get("weights", {}) or {}).get("default")
     return default_w
 
@@ -394,16 +654,15 @@ def get_effective_policy(course_id: int, cli_policy: Optional[str], cfg: Dict[st
     # Precedence: CLI > config.by_course_id > config.default > script default
     if cli_policy:
         return cli_policy
-    by_id = (cfg.get("final_policy", {}) or {}).get("by_course_id", {})
-    if str(course_id) in by_id:
-        return by_id[str(course_id)]
-    if course_id in by_id:
-        return by_id[course_id]
+    by_id = (cfg.get("final_policy", {}) or {}).get("by_course_id") or {}  # str-keyed by load_config
+    key = str(course_id)
+    if key in by_id:
+        return by_id[key]
     default_p = (cfg.get("final_policy", {}) or {}).get("default")
     return default_p or FinalPolicy.MISSING_ZERO_UPCOMING_IGNORE
 
 
-def build_exclusions(cli_ids: Optional[str], cli_names: Optional[List[str]], cfg: Dict[str, Any]) -> tuple[set[int], List[str]]:
+def build_exclusions(cli_ids: Optional[str], cli_names: Optional[List[str]], cfg: Dict[str, Any]) -> tuple[set[int], Tuple[str, ...]]:
     ids: set[int] = set()
     # From config
     for v in (cfg.get("exclusions", {}) or {}).get("ids", []):
@@ -425,55 +684,81 @@ def build_exclusions(cli_ids: Optional[str], cli_names: Optional[List[str]], cfg
     names = [(s or "").lower() for s in (cfg.get("exclusions", {}) or {}).get("name_contains", [])]
     if cli_names:
         names.extend([(s or "").lower() for s in cli_names])
-    return ids, names
+    # Deduplicated, immutable pattern set scanned by should_skip for every course
+    return ids, tuple(dict.fromkeys(names))
 
 # ----------------------------- CSV Export ----------------------------- #
 
+CSV_BUFFER_SIZE = 1 << 20
+
+
+def format_cell(x: Optional[float]) -> str:
+    # Shared 2-decimal CSV cell format; blank for missing values
+    return f"{x:.2f}" if x is not None else ""
+
+MULTI_CSV_HEADER = ["Course", "Course ID", "Category", "Weight %", "Run Earned", "Run Possible", "Run %", "Final Earned", "Final Possible", "Final %", "Running Total %", "Final Total %", "Policy"]
+
+
+def category_rows(rollup: CourseRollup) -> List[list]:
+    """One multi-course CSV row per category of the rollup."""
+    r = rollup
+    running_total = format_cell(r.running_total_pct)
+    final_total = format_cell(r.final_total_pct)
+    return [
+        [
+            r.course_name,
+            r.course_id,
+            c.group_name,
+            format_cell(c.weight_pct),
+            format_cell(c.running_earned),
+            format_cell(c.running_possible),
+            format_cell(c.running_pct),
+            format_cell(c.final_earned),
+            format_cell(c.final_possible),
+            format_cell(c.final_pct),
+            running_total,
+            final_total,
+            r.policy,
+        ]
+        for c in r.categories
+    ]
+
+
 def export_csv_single(path: str, rollup: CourseRollup):
-    with open(path, "w", newline="", encoding="utf-8") as f:
+    with open(path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f:
         w = csv.writer(f)
-        w.writerow(["Course", rollup.course_name])
-        w.writerow(["Course ID", rollup.course_id])
-        w.writerow(["Final Policy", rollup.policy])
-        w.writerow([])
-        w.writerow(["Category", "Weight %", "Run Earned", "Run Possible", "Run %", "Final Earned", "Final Possible", "Final %"])
-        for c in rollup.categories:
-            w.writerow([
+        w.writerows([
+            ["Course", rollup.course_name],
+            ["Course ID", rollup.course_id],
+            ["Final Policy", rollup.policy],
+            [],
+            ["Category", "Weight %", "Run Earned", "Run Possible", "Run %", "Final Earned", "Final Possible", "Final %"],
+        ])
+        w.writerows([
+            [
                 c.group_name,
-                f"{c.weight_pct:.2f}",
-                f"{c.running_earned:.2f}",
-                f"{c.running_possible:.2f}",
-                f"{c.running_pct:.2f}" if c.running_pct is not None else "",
-                f"{c.final_earned:.2f}",
-                f"{c.final_possible:.2f}",
-                f"{c.final_pct:.2f}" if c.final_pct is not None else "",
-            ])
-        w.writerow([])
-        w.writerow(["Running Total %", f"{rollup.running_total_pct:.2f}" if rollup.running_total_pct is not None else ""])
-        w.writerow(["Final Total %", f"{rollup.final_total_pct:.2f}" if rollup.final_total_pct is not None else ""])
+                format_cell(c.weight_pct),
+                format_cell(c.running_earned),
+                format_cell(c.running_possible),
+                format_cell(c.running_pct),
+                format_cell(c.final_earned),
+                format_cell(c.final_possible),
+                format_cell(c.final_pct),
+            ]
+            for c in rollup.categories
+        ])
+        w.writerows([
+            [],
+            ["Running Total %", format_cell(rollup.running_total_pct)],
+            ["Final Total %", format_cell(rollup.final_total_pct)],
+        ])
 
 
 def export_csv_multi(path: str, rollups: List[CourseRollup]):
-    with open(path, "w", newline="", encoding="utf-8") as f:
+    with open(path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f:
         w = csv.writer(f)
-        w.writerow(["Course", "Course ID", "Category", "Weight %", "Run Earned", "Run Possible", "Run %", "Final Earned", "Final Possible", "Final %", "Running Total %", "Final Total %", "Policy"]) 
-        for r in rollups:
-            for c in r.categories:
-                w.writerow([
-                    r.course_name,
-                    r.course_id,
-                    c.group_name,
-                    f"{c.weight_pct:.2f}",
-                    f"{c.running_earned:.2f}",
-                    f"{c.running_possible:.2f}",
-                    f"{c.running_pct:.2f}" if c.running_pct is not None else "",
-                    f"{c.final_earned:.2f}",
-                    f"{c.final_possible:.2f}",
-                    f"{c.final_pct:.2f}" if c.final_pct is not None else "",
-                    f"{r.running_total_pct:.2f}" if r.running_total_pct is not None else "",
-                    f"{r.final_total_pct:.2f}" if r.final_total_pct is not None else "",
-                    r.policy,
-                ])
+        w.writerow(MULTI_CSV_HEADER)
+        w.writerows([row for r in rollups for row in category_rows(r)])
 
 # ----------------------------- CLI & Main ----------------------------- #
 
@@ -506,6 +791,8 @@ def parse_args():
     ], help="How to treat ungraded work when estimating the final grade (global override)")
     p.add_argument("--show-assignments", action="store_true", help="Print a table of all assignments and their status per course")
     p.add_argument("--csv", help="Path to export CSV results (single or multi-course)")
+    p.add_argument("--refresh", action="store_true", help="Ignore cached Canvas responses and fetch everything fresh")
+    p.add_argument("--no-cache", action="store_true", help="Do not read or write the on-disk response cache")
     return p.parse_args()
 
 def load_weights_from_args(args) -> Optional[Dict[str, float]]:
@@ -551,10 +838,17 @@ def main():
     def should_skip(name: str | None, cid: int) -> bool:
         if cid in exclude_ids:
             return True
+        if not exclude_names:
+            return False
         lname = (name or "").lower()
         return any(sub in lname for sub in exclude_names)
 
-    client = CanvasClient(base_url, token)
+    client = CanvasClient(
+        base_url,
+        token,
+        cache_dir=None if args.no_cache else default_cache_dir(),
+        refresh=args.refresh,
+    )
 
     # CLI global weights (if provided) override config/Canvas
     cli_global_weights = load_weights_from_args(args)
@@ -584,6 +878,7 @@ def main():
         end_utc = now_utc + timedelta(days=7)
         items: List[Tuple[datetime, str, int, str, float]] = []  # (due, course_name, course_id, assignment_name, points)
         seen_courses = set()
+        week_courses: List[Tuple[int, str]] = []
         for st in states:
             for c in client.list_my_courses(state=st):
                 cid = c.get("id")
@@ -591,7 +886,11 @@ def main():
                 if not cid or cid in seen_courses or should_skip(cname, cid):
                     continue
                 seen_courses.add(cid)
-                for a in client.get_assignments_with_submissions(cid):
+                week_courses.append((cid, cname))
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            per_course = ex.map(client.get_assignments_with_submissions, [cid for cid, _ in week_courses])
+            for (cid, cname), assignments in zip(week_courses, per_course):
+                for a in assignments:
                     if not a.published:
                         continue
                     due = parse_due(a.due_at)
@@ -610,11 +909,14 @@ def main():
             print(f"{due_str:<21}| {cname[:30]:<30} | {aname[:32]:<32} | {pts:>4.0f}")
         return
 
-    def handle_course(cid: int):
+    def handle_course(cid: int) -> Tuple[CourseRollup, WeightPlan, List[Assignment], Optional[str]]:
+        # Runs on worker threads: fetch and compute only, printing happens in report_course
+        # (including the fallback notice, returned last so it stays with its course).
+        notice = None
         policy = get_effective_policy(cid, args.final_policy, cfg)
         groups, groups_by_id = client.get_assignment_groups(cid)
         assignments = client.get_assignments_with_submissions(cid)
-        by_group = categorize_assignments(assignments, groups_by_id)
+        ensure_uncategorized_group(groups_by_id)
 
         # Determine weights with precedence (CLI > config.by_course_id > config.default > Canvas)
         weights = get_effective_weights(cid, cli_global_weights, cfg)
@@ -622,12 +924,13 @@ def main():
             weight_plan = WeightPlan.from_user(weights, groups)
         except ValueError:
             # No usable weights from CLI/config/Canvas. Fallback to equal weights across observed groups.
-            group_names = [groups_by_id[gid].name for gid in by_group.keys()] or ["(Uncategorized)"]
+            observed_gids = {a.assignment_group_id or -1 for a in assignments}
+            group_names = [groups_by_id[gid].name for gid in observed_gids] or ["(Uncategorized)"]
             auto_weights = {name: 1.0 for name in group_names}
-            print(f"[INFO] No weights for course {cid}; using equal weights across {len(auto_weights)} group(s).", file=sys.stderr)
+            notice = f"[INFO] No weights for course {cid}; using equal weights across {len(auto_weights)} group(s)."
             weight_plan = WeightPlan.from_user(auto_weights, groups)
 
-        categories = compute_category_results(by_group, groups_by_id, weight_plan, policy)
+        categories = compute_course(assignments, groups_by_id, weight_plan, policy)
         running_total, final_total = weighted_total(categories)
         course = client.get_course(cid)
         r = CourseRollup(
@@ -638,8 +941,11 @@ def main():
             policy=policy,
             categories=categories,
         )
-        rollups.append(r)
+        return r, weight_plan, assignments, notice
 
+    def report_course(r: CourseRollup, weight_plan: WeightPlan, assignments: List[Assignment], notice: Optional[str]):
+        if notice:
+            print(notice, file=sys.stderr)
         # ---- Print course report ----
         print(f"\n=== {r.course_name} (ID {r.course_id}) ===")
         print("Weights:")
@@ -660,10 +966,32 @@ def main():
             print("{:<8} {:<36} {:<20} {:>7} {:>7} {:>8} {:>8}".format("GroupID", "Assignment", "Due", "Pts", "Score", "Missing", "Excused"))
             print("-" * 110)
             for a in sorted(assignments, key=lambda x: (x.assignment_group_id or -1, x.due_at or "9999")):
-                sub = a.submission or Submission()
+                sub_score, missing, excused = a.sub_raw or NO_SUBMISSION
                 pts = a.points_possible or 0.0
-                score = "" if sub.score is None else f"{sub.score:.2f}"
-                print(f"{(a.assignment_group_id or -1):<8} {a.name[:36]:<36} {str(a.due_at or '-'):<20} {pts:>7.2f} {score:>7} {str(bool(sub.missing))[:5]:>8} {str(bool(sub.excused))[:5]:>8}")
+                score = "" if sub_score is None else f"{sub_score:.2f}"
+                print(f"{(a.assignment_group_id or -1):<8} {a.name[:36]:<36} {str(a.due_at or '-'):<20} {pts:>7.2f} {score:>7} {str(missing)[:5]:>8} {str(excused)[:5]:>8}")
+
+    def run_courses(course_ids: List[int], csv_file=None):
+        # Results are consumed in submission order so output stays deterministic.
+        # With csv_file, each course's rows are written as soon as it is reported
+        # instead of being kept in rollups until the end.
+        writer = csv.writer(csv_file) if csv_file is not None else None
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            futures = [ex.submit(handle_course, cid) for cid in course_ids]
+            try:
+                for fut in futures:
+                    r, weight_plan, assignments, notice = fut.result()
+                    report_course(r, weight_plan, assignments, notice)
+                    if writer is None:
+                        rollups.append(r)
+                    else:
+                        writer.writerows(category_rows(r))
+                        csv_file.flush()
+            except BaseException:
+                # Stop at the first failing course: drop queued courses instead of
+                # fetching them all before the error surfaces
+                ex.shutdown(wait=False, cancel_futures=True)
+                raise
 
     # --------- Select courses ---------
     if args.course_id and args.course_name:
@@ -672,6 +1000,7 @@ def main():
     if args.all_courses:
         states = ["active"] + (["completed"] if args.include_completed else [])
         seen = set()
+        course_ids: List[int] = []
         for st in states:
             for c in client.list_my_courses(state=st):
                 cid = c.get("id")
@@ -679,7 +1008,15 @@ def main():
                 if not cid or cid in seen or should_skip(cname, cid):
                     continue
                 seen.add(cid)
-                handle_course(cid)
+                course_ids.append(cid)
+        if args.csv and len(course_ids) != 1:
+            # Multi-course CSV: stream rows per course rather than holding every rollup
+            with open(args.csv, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as f:
+                csv.writer(f).writerow(MULTI_CSV_HEADER)
+                run_courses(course_ids, csv_file=f)
+            print(f"CSV results written to {args.csv}")
+            return
+        run_courses(course_ids)
     else:
         if args.course_name:
             query = args.course_name.lower()
@@ -705,7 +1042,7 @@ def main():
                 for cid, cname in matches:
                     print(f"  - {cname} (ID {cid})", file=sys.stderr)
                 sys.exit(2)
-            handle_course(matches[0][0])
+            run_courses([matches[0][0]])
         else:
             if not args.course_id:
                 print("Error: must provide --course-id, --course-name, or --all-courses", file=sys.stderr)
@@ -713,7 +1050,7 @@ def main():
             if should_skip(None, args.course_id):
                 print(f"Course {args.course_id} excluded")
                 sys.exit(0)
-            handle_course(args.course_id)
+            run_courses([args.course_id])
 
     # --------- CSV export ---------
     if args.csv:
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Interactive setup for Canvas Grade Calculator.
-Creates a YAML config file with:
+Creates a YAML (or, for a .json --out path, JSON) config file with:
   - Canvas base URL and API token
   - Excluded course IDs and name substrings
   - Default weights and per-course weights
@@ -10,35 +10,86 @@ Creates a YAML config file with:
 Usage:
   python setup_canvas_grade_config.py --out config.yaml
 
+Non-interactive use (scripts/CI): pipe the config as a JSON object on stdin:
+  python setup_canvas_grade_config.py --stdin-json --out config.yaml < cfg.json
+
+  {
+    "canvas": {"base_url": "https://school.instructure.com", "token": "..."},
+    "exclusions": {"ids": [123], "name_contains": ["Sandbox"]},
+    "weights": {"default": {"Homework": 40, "Exams": 60}, "by_course_id": {"123": {...}}},
+    "final_policy": {"default": "missing_zero_upcoming_ignore", "by_course_id": {"123": "all_zero"}}
+  }
+Every section is optional (null counts as absent) but must be an object, and
+the exclusion lists must be arrays; the config is otherwise written as-is.
+
 After this runs, it prints example commands to use the calculator.
 """
-from __future__ import annotations
-
-import argparse
-import getpass
 import os
-from typing import Dict, Any
+import sys
+from functools import cache
+from types import SimpleNamespace
+from typing import Dict, Any, Callable, List, Optional, Tuple, TypeVar
 
-try:
-    import yaml  # type: ignore
-except Exception:
-    yaml = None
+V = TypeVar("V")
 
-FINAL_POLICIES = [
+FINAL_POLICIES = (
     "ignore_all",
     "missing_zero_upcoming_ignore",
     "all_zero",
-]
+)
+_FINAL_POLICIES_SET = frozenset(FINAL_POLICIES)  # membership checks; the tuple keeps display order
+_FINAL_POLICIES_STR = ", ".join(FINAL_POLICIES)
+
+USAGE = "usage: setup_canvas_grade_config.py [-h] [--out OUT] [--stdin-json]"
+HELP = f"""{USAGE}
+
+Initialize Canvas Grade Calculator config
+
+options:
+  -h, --help    show this help message and exit
+  --out OUT     Path to write the config file (YAML, or JSON if it ends in .json)
+  --stdin-json  Read the config as a JSON object from stdin instead of prompting"""
+
+def usage_error(msg: str):
+    print(USAGE, file=sys.stderr)
+    print(f"setup_canvas_grade_config.py: error: {msg}", file=sys.stderr)
+    sys.exit(2)
 
-def parse_args():
-    p = argparse.ArgumentParser(description="Initialize Canvas Grade Calculator config")
-    p.add_argument("--out", default="config.yaml", help="Path to write the config file (YAML)")
-    return p.parse_args()
+def parse_args(argv: Optional[List[str]] = None):
+    # Hand-rolled instead of argparse: with only --out and --stdin-json, importing
+    # and building a full parser would dominate startup
+    argv = sys.argv[1:] if argv is None else argv
+    out = "config.yaml"
+    stdin_json = False
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg in ("-h", "--help"):
+            print(HELP)
+            sys.exit(0)
+        elif arg == "--out":
+            if i + 1 >= len(argv):
+                usage_error("argument --out: expected one argument")
+            out = argv[i + 1]
+            i += 1
+        elif arg.startswith("--out="):
+            out = arg[len("--out="):]
+        elif arg == "--stdin-json":
+            stdin_json = True
+        else:
+            usage_error(f"unrecognized arguments: {' '.join(argv[i:])}")
+        i += 1
+    return SimpleNamespace(out=out, stdin_json=stdin_json)
 
-def prompt(msg: str, default: str | None = None) -> str:
-    d = f" [{default}]" if default else ""
-    val = input(f"{msg}{d}: ").strip()
-    return val or (default or "")
+def _is_int(s: str) -> bool:
+    # Validation by predicate rather than int() in try/except; isdecimal() accepts
+    # exactly the digits int() does
+    return (s[1:] if s.startswith("-") else s).isdecimal()
+
+def prompt(msg: str, default: Optional[str] = None) -> str:
+    # Plain concatenation on the common no-default path; only format when showing a default
+    suffix = f" [{default}]: " if default else ": "
+    return input(msg + suffix).strip() or (default or "")
 
 def yesno(msg: str, default: bool = True) -> bool:
     d = "Y/n" if default else "y/N"
@@ -47,62 +98,184 @@ def yesno(msg: str, default: bool = True) -> bool:
         return default
     return val in ("y", "yes")
 
-def collect_weights(kind: str) -> Dict[str, float]:
+def parse_weight(val: str) -> Optional[float]:
+    try:
+        return float(val.strip().replace('%', ''))
+    except ValueError:
+        return None
+
+def parse_pairs(line: str, parse_value: Callable[[str], Optional[V]]) -> Optional[List[Tuple[str, V]]]:
+    """
+    Parse a batch entry like "Homework:20, Exam 1:30" into [(key, value), ...].
+    Returns None unless every comma-separated item is key:value with a value
+    parse_value accepts, so ordinary single entries (even ones containing ':')
+    fall through to the one-at-a-time prompts.
+    """
+    if ':' not in line:
+        return None
+    pairs: List[Tuple[str, V]] = []
+    for item in line.split(','):
+        key, sep, raw = item.rpartition(':')
+        key = key.strip()
+        value = parse_value(raw.strip()) if sep and key else None
+        if value is None:
+            return None
+        pairs.append((key, value))
+    return pairs
+
+def collect_weights(kind: str) -> List[Tuple[str, float]]:
+    # (name, weight) pairs in entry order; converted with dict() when the config is built
     print(f"\nEnter {kind} weights (blank name to stop). You can enter raw numbers or percents; they will be normalized to 100%.")
-    weights: Dict[str, float] = {}
+    print("  Several can be entered on one line as Name:weight pairs, e.g. Homework:20, Exam 1:30")
+    weights: List[Tuple[str, float]] = []
     while True:
         name = input("  Category name: ").strip()
         if not name:
             break
-        val = input("  Weight (number or %): ").strip().replace('%', '')
-        try:
-            w = float(val)
-        except Exception:
+        batch = parse_pairs(name, parse_weight)
+        if batch is not None:
+            weights.extend((sys.intern(n), w) for n, w in batch)
+            continue
+        w = parse_weight(input("  Weight (number or %): "))
+        if w is None:
             print("    Invalid number; try again.")
             continue
-        weights[name] = w
+        weights.append((sys.intern(name), w))  # repeated names across courses share one str
     return weights
 
-def collect_by_course_weights() -> Dict[str, Dict[str, float]]:
-    print("\nAdd per-course weight overrides (blank Course ID to stop).")
-    by_id: Dict[str, Dict[str, float]] = {}
+def read_course_id(handle_other: Optional[Callable[[str], bool]] = None) -> Optional[str]:
+    """
+    Prompt for a course ID until an integer is entered (returned as the config's
+    str key) or a blank line (None). handle_other may consume a non-integer line,
+    such as a batch entry, by returning True.
+    """
     while True:
         cid = input("  Course ID: ").strip()
         if not cid:
-            break
-        try:
-            int(cid)
-        except Exception:
-            print("    Course ID must be an integer; try again.")
+            return None
+        if _is_int(cid):
+            return cid
+        if handle_other is not None and handle_other(cid):
             continue
+        print("    Course ID must be an integer; try again.")
+
+# Patterns for parse_int_list; re compiles and caches them on first use. Each
+# whitespace run belongs to exactly one \s*, so matching cannot backtrack
+# exponentially on runs of blank entries.
+_INT_PATTERN = r"-?\d+"
+_INT_LIST_PATTERN = r"\s*(?:-?\d+\s*)?(?:,\s*(?:-?\d+\s*)?)*"
+
+def parse_int_list(csv_line: str) -> List[int]:
+    """Integers from a comma-separated line; other tokens are reported and skipped."""
+    import re  # only needed here; kept off the startup path
+    # Fast path: a well-formed line is validated and tokenized by two C-level regex scans
+    if re.fullmatch(_INT_LIST_PATTERN, csv_line):
+        return list(map(int, re.findall(_INT_PATTERN, csv_line)))
+    tokens = [t for t in (x.strip() for x in csv_line.split(',')) if t]
+    for t in tokens:
+        if not _is_int(t):
+            print(f"  Skipping non-integer: {t}")
+    return [int(t) for t in tokens if _is_int(t)]
+
+def collect_by_course_weights() -> Dict[str, List[Tuple[str, float]]]:
+    print("\nAdd per-course weight overrides (blank Course ID to stop).")
+    by_id: Dict[str, List[Tuple[str, float]]] = {}
+    while (cid := read_course_id()) is not None:
         print(f"  Enter weights for course {cid} ...")
         by_id[cid] = collect_weights("course-specific")
     return by_id
 
 def collect_by_course_policy() -> Dict[str, str]:
-    print("\nAdd per-course final policy overrides (blank Course ID to stop). Options: " + ", ".join(FINAL_POLICIES))
+    print("\nAdd per-course final policy overrides (blank Course ID to stop). Options: " + _FINAL_POLICIES_STR)
+    print("  Several can be entered on one line as CourseID:policy pairs, e.g. 12345:all_zero, 67890:ignore_all")
     by_id: Dict[str, str] = {}
-    while True:
-        cid = input("  Course ID: ").strip()
-        if not cid:
-            break
-        try:
-            int(cid)
-        except Exception:
-            print("    Course ID must be an integer; try again.")
-            continue
+
+    def add_batch(line: str) -> bool:
+        batch = parse_pairs(line, lambda pol: pol if pol in _FINAL_POLICIES_SET else None)
+        if batch is None or not all(_is_int(k) for k, _ in batch):
+            return False
+        for k, pol in batch:
+            by_id[sys.intern(k)] = pol
+        return True
+
+    while (cid := read_course_id(add_batch)) is not None:
         pol = input("  Final policy: ").strip()
-        if pol not in FINAL_POLICIES:
-            print("    Invalid policy; choose one of: " + ", ".join(FINAL_POLICIES))
+        if pol not in _FINAL_POLICIES_SET:
+            print("    Invalid policy; choose one of: " + _FINAL_POLICIES_STR)
             continue
-        by_id[cid] = pol
+        by_id[sys.intern(cid)] = pol
     return by_id
 
-def main():
-    args = parse_args()
-    if yaml is None:
-        print("This tool requires PyYAML. Install with: pip install pyyaml")
-        return
+@cache
+def next_steps(base_url: str, out: str) -> str:
+    """The closing instructions printed after setup, as one string."""
+    return "\n".join([
+        "",
+        "Next steps:",
+        "  1) (Optional) export env vars if you prefer not to keep token in file:",
+        f"     export CANVAS_BASE_URL=\"{base_url}\"",
+        "     export CANVAS_TOKEN=\"<your token>\"",
+        "  2) Run the grade calculator. Examples:\n",
+        "     # All active courses using config",
+        f"     python canvas_grade_calculator.py --all-courses --config {out}\n",
+        "     # Include completed",
+        f"     python canvas_grade_calculator.py --all-courses --include-completed --config {out}\n",
+        "     # Single course with per-course weights from config (if present)",
+        f"     python canvas_grade_calculator.py --course-id 12345 --config {out}\n",
+        "     # CLI still works and overrides config where provided",
+        f"     python canvas_grade_calculator.py --course-id 210272 --weights '{{\"Homework\":20, \"Exam 1\":25, \"Exam 2\":25, \"Exam 3\":30}}' --final-policy all_zero --config {out}\n",
+        "🎉 Setup complete.",
+    ]) + "\n"
+
+def read_stdin_config() -> Dict[str, Any]:
+    import json
+    try:
+        cfg = json.load(sys.stdin)
+    except ValueError as e:
+        usage_error(f"--stdin-json: invalid JSON on stdin: {e}")
+    if not isinstance(cfg, dict):
+        usage_error("--stdin-json: expected a JSON object on stdin")
+    check_config_shape(cfg)
+    return cfg
+
+_CONFIG_SECTIONS = ("canvas", "exclusions", "weights", "final_policy")
+
+def check_config_shape(cfg: Dict[str, Any]):
+    """
+    Check the shapes the calculator relies on: each documented section,
+    weights.default, each per-course weight map and both by_course_id maps must
+    be objects; exclusions.ids and exclusions.name_contains must be arrays (names
+    as strings). A null section or exclusion list is dropped so it reads as absent.
+    Values inside (weights, policy names, ids) are not checked.
+    """
+    def must_be(value: Any, kind: type, where: str):
+        if value is not None and not isinstance(value, kind):
+            kind_name = "object" if kind is dict else "array"
+            usage_error(f"--stdin-json: {where} must be a JSON {kind_name}, not {type(value).__name__}")
+
+    def drop_null(section: Dict[str, Any], name: str):
+        if name in section and section[name] is None:
+            del section[name]
+
+    for name in _CONFIG_SECTIONS:
+        drop_null(cfg, name)
+        must_be(cfg.get(name), dict, name)
+    weights = cfg.get("weights") or {}
+    must_be(weights.get("default"), dict, "weights.default")
+    must_be(weights.get("by_course_id"), dict, "weights.by_course_id")
+    for cid, w in (weights.get("by_course_id") or {}).items():
+        must_be(w, dict, f"weights.by_course_id.{cid}")
+    must_be((cfg.get("final_policy") or {}).get("by_course_id"), dict, "final_policy.by_course_id")
+    exclusions = cfg.get("exclusions") or {}
+    for name in ("ids", "name_contains"):
+        drop_null(exclusions, name)
+        must_be(exclusions.get(name), list, f"exclusions.{name}")
+    for s in exclusions.get("name_contains") or []:
+        if not isinstance(s, str):
+            usage_error(f"--stdin-json: exclusions.name_contains entries must be strings, not {type(s).__name__}")
+
+def prompt_config() -> Dict[str, Any]:
+    import getpass
 
     print("\n=== Canvas connection ===")
     base_url = prompt("Canvas base URL", os.getenv("CANVAS_BASE_URL") or "https://school.instructure.com")
@@ -110,32 +283,20 @@ def main():
 
     print("\n=== Exclusions ===")
     ids_csv = prompt("Exclude course IDs (comma-separated)", "")
-    excl_ids = []
-    for x in ids_csv.split(','):
-        x = x.strip()
-        if not x:
-            continue
-        try:
-            excl_ids.append(int(x))
-        except Exception:
-            print(f"  Skipping non-integer: {x}")
-    name_subs = []
-    while True:
-        s = prompt("Exclude courses whose NAME contains (blank to stop)", "")
-        if not s:
-            break
-        name_subs.append(s)
+    excl_ids = parse_int_list(ids_csv)
+    # Prompt repeatedly until a blank answer
+    name_subs = list(iter(lambda: prompt("Exclude courses whose NAME contains (blank to stop)", ""), ""))
 
     print("\n=== Weights ===")
     default_weights = collect_weights("DEFAULT")
     by_course_weights = collect_by_course_weights()
 
     print("\n=== Final policy ===")
-    print("Options:", ", ".join(FINAL_POLICIES))
+    print("Options:", _FINAL_POLICIES_STR)
     default_policy = prompt("Default final policy", "missing_zero_upcoming_ignore")
     by_course_policy = collect_by_course_policy()
 
-    cfg: Dict[str, Any] = {
+    return {
         "canvas": {
             "base_url": base_url,
             "token": token,
@@ -145,33 +306,57 @@ def main():
             "name_contains": name_subs,
         },
         "weights": {
-            "default": default_weights or None,
-            "by_course_id": by_course_weights,
+            # dict() keeps the first position and the last value of a repeated name
+            "default": dict(default_weights) or None,
+            "by_course_id": {cid: dict(w) for cid, w in by_course_weights.items()} or None,
         },
         "final_policy": {
             "default": default_policy,
-            "by_course_id": by_course_policy,
+            "by_course_id": by_course_policy or None,
         },
     }
 
-    with open(args.out, "w", encoding="utf-8") as f:
-        yaml.safe_dump(cfg, f, sort_keys=False, allow_unicode=True)
-
-    print(f"\n✅ Wrote {args.out}")
-    print("\nNext steps:")
-    print("  1) (Optional) export env vars if you prefer not to keep token in file:")
-    print(f"     export CANVAS_BASE_URL=\"{base_url}\"")
-    print(f"     export CANVAS_TOKEN=\"<your token>\"")
-    print("  2) Run the grade calculator. Examples:\n")
-    print("     # All active courses using config")
-    print(f"     python canvas_grade_calculator.py --all-courses --config {args.out}\n")
-    print("     # Include completed")
-    print(f"     python canvas_grade_calculator.py --all-courses --include-completed --config {args.out}\n")
-    print("     # Single course with per-course weights from config (if present)")
-    print(f"     python canvas_grade_calculator.py --course-id 12345 --config {args.out}\n")
-    print("     # CLI still works and overrides config where provided")
-    print(f"     python canvas_grade_calculator.py --course-id 210272 --weights '{{\"Homework\":20, \"Exam 1\":25, \"Exam 2\":25, \"Exam 3\":30}}' --final-policy all_zero --config {args.out}\n")
-    print("🎉 Setup complete.")
+def main():
+    args = parse_args()
+    # Imported only after argument parsing so --help and usage errors stay fast
+    import json
+    write_json = args.out.lower().endswith(".json")
+    if not write_json:
+        try:
+            # Optional: pylibyaml patches yaml to prefer the libyaml C backends
+            import pylibyaml  # type: ignore  # noqa: F401
+        except ImportError:
+            pass
+        try:
+            import yaml  # type: ignore
+        except Exception:
+            print("This tool requires PyYAML for YAML output. Install with: pip install pyyaml (or use --out config.json)")
+            return
+        try:
+            from yaml import CSafeDumper as YamlDumper  # libyaml C emitter
+        except ImportError:
+            from yaml import SafeDumper as YamlDumper
+
+    cfg = read_stdin_config() if args.stdin_json else prompt_config()
+    base_url = (cfg.get("canvas") or {}).get("base_url") or ""
+
+    if write_json:
+        # The config is plain data, so JSON needs neither PyYAML nor a sidecar
+        with open(args.out, "wb") as f:
+            f.write((json.dumps(cfg, indent=2, ensure_ascii=False) + "\n").encode("utf-8"))
+        print(f"\n✅ Wrote {args.out}")
+    else:
+        # Render in memory so the emitter's many small fragments become one file write
+        text = yaml.dump(cfg, Dumper=YamlDumper, sort_keys=False, allow_unicode=True, default_flow_style=False, width=4096)
+        with open(args.out, "wb") as f:
+            f.write(text.encode("utf-8"))
+        # JSON copy written after the YAML, so its mtime marks it as current; the
+        # calculator reads it instead of re-parsing YAML until the YAML is edited
+        with open(args.out + ".json", "wb") as jf:
+            jf.write(json.dumps(cfg).encode("utf-8"))
+        print(f"\n✅ Wrote {args.out} (and {args.out}.json cache)")
+    # One write for the whole epilogue instead of a print() per line
+    sys.stdout.write(next_steps(base_url, args.out))
 
 if __name__ == "__main__":
     main()